@@ -1,32 +1,157 @@
-import os, sys, io, logging, tomllib, subprocess, requests
-from urllib.parse import urlparse
+import os, re, sys, json, queue, logging, tomllib, subprocess, threading, functools, contextlib, requests
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+from urllib3.util import Retry
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import overload, Literal, Generator, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
+from typing import overload, Literal, Generator, Iterable, Callable, Optional, Any
+
+try:
+    # optional, faster json parser and serializer for the platforms api responses and their caches
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 
 RESETED_BRANCHES = []
 FAILED_REPOS = []
 FAILED_MAPPINGS = []
-STDOUT = sys.__stdout__
-STDERR = sys.__stderr__
-PRINT_BUFFER = io.StringIO()
+# guards the report lists above, as they are appended to from the sync worker threads
+REPORTS_LOCK = threading.Lock()
+# where the output of git commands goes. Silenced unless running in DEBUG level, set once before syncing starts
+GIT_OUTPUT = subprocess.DEVNULL
+
+# syncing is bound by network and disk, not cpu, so we can afford more threads than cores
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# how many requests for the repositories details can be waiting for their response at once, per platform
+MAX_PENDING_REQUESTS = 32
+EXCLUDE_REPOS = frozenset()
+EXCLUDE_BY_ORG = {}
+LANGUAGE_BY_KEYWORD = {}
+
+# extra arguments given to git clone, and to git fetch, for each of the available clone modes
+CLONE_MODE = "full"
+CLONE_MODES_ARGS = {
+    "full": [],
+    "treeless": ["--filter=tree:0"],
+    "blobless": ["--filter=blob:none"],
+    "shallow": ["--depth=1", "--no-single-branch"],
+}
+FETCH_MODES_ARGS = {
+    "full": [],
+    "treeless": ["--filter=tree:0"],
+    "blobless": ["--filter=blob:none"],
+    "shallow": [],
+}
+
+
+CONFIG_PATH = Path(__file__).parent.parent.parent / ".secret_config.toml"
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_config(path: Path, mtime_ns: int) -> dict:
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_config(path: str | Path = CONFIG_PATH) -> dict:
+    """Load the toml config file. It is parsed again only if the file was modified since the last load.
+
+    Args:
+        path (str | Path): The path of the config file. Defaults to the .secret_config.toml at the root of the repo.
+
+    Returns:
+        dict: The parsed config.
+    """
+    path = Path(path)
+    return _parse_config(path, path.stat().st_mtime_ns)
+
 
-MAX_WORKERS = 4
-EXCLUDE_REPOS = {}
-LANGUAGE_MAPPING = {}
+# on Windows, git processes are started without allocating them a console window, which makes each spawn cheaper
+# when running detached from a terminal (as a scheduled task for example)
+GIT_CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+
+# environment of the git pull calls, computed once rather than copying os.environ for each pull
+PULL_ENV = {**os.environ, "GIT_MERGE_AUTOEDIT": "false"}
+
+# ahead and behind commits counts, in the output of git status --porcelain=v2 --branch
+BRANCH_AB_PATTERN = re.compile(rb"# branch\.ab \+(\d+) -(\d+)")
 
 
 def process_config(config: dict) -> str:
-    global LANGUAGE_MAPPING, EXCLUDE_REPOS, MAX_WORKERS
-    LANGUAGE_MAPPING = dict(config.get("language_mapping", {}))
-    EXCLUDE_REPOS = set(config.get("exclude_repositories", []))
-    MAX_WORKERS = config.get("max_concurrent_workers", 4)
+    global LANGUAGE_BY_KEYWORD, EXCLUDE_REPOS, EXCLUDE_BY_ORG, MAX_WORKERS, CLONE_MODE
+    # the language mapping is reversed once here, so that finding the language of a topic is a single dict lookup.
+    # if a keyword is associated to several languages, the first language of the config takes precedence
+    LANGUAGE_BY_KEYWORD = {}
+    for language, associated_values in config.get("language_mapping", {}).items():
+        for associated in associated_values:
+            LANGUAGE_BY_KEYWORD.setdefault(str(associated).lower(), language)
+    # lowercased once here, to compare them with the lowercased GitLab projects paths
+    EXCLUDE_REPOS = frozenset(str(excluded).lower() for excluded in config.get("exclude_repositories", []))
+    # the same exclusions, grouped by organization, to check repos against them without building their full name
+    EXCLUDE_BY_ORG = {}
+    for excluded in config.get("exclude_repositories", []):
+        organization_name, _, repository_name = excluded.rpartition("/")
+        EXCLUDE_BY_ORG.setdefault(organization_name, set()).add(repository_name)
+    EXCLUDE_BY_ORG = {organization_name: frozenset(names) for organization_name, names in EXCLUDE_BY_ORG.items()}
+    MAX_WORKERS = config.get("max_concurrent_workers", MAX_WORKERS)
+    CLONE_MODE = config.get("clone_mode", "full")
+    if CLONE_MODE not in CLONE_MODES_ARGS:
+        raise ValueError(f"clone_mode must be one of {list(CLONE_MODES_ARGS.keys())}, got '{CLONE_MODE}'")
 
     return config["backup_path"]
 
 
+class JsonFileCache:
+    """A key to value cache, persisted in a json file. Can be used from several threads at once."""
+
+    def __init__(self, path: str | Path):
+        """Load the cache content from the file, if it exists.
+
+        Args:
+            path (str | Path): The path of the json file storing the cache.
+        """
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        try:
+            with open(self.path, "rb") as f:
+                self.data: dict[str, Any] = json_loads(f.read())
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, key: str, default=None) -> Any:
+        with self.lock:
+            return self.data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self.lock:
+            self.data[key] = value
+
+    def save(self):
+        """Write the cache content to the file, replacing it at once so that an interrupted save can't corrupt it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with self.lock:
+            with open(temp_path, "wb") as f:
+                f.write(json_dumps(self.data))
+        os.replace(temp_path, self.path)
+
+
+# responses of the platforms apis, with their ETag, to make conditional requests on the next runs. Set up by run
+ETAGS_CACHE_PATH = Path.home() / ".cache" / "git_backuper" / "etags.json"
+ETAGS_CACHE: Optional[JsonFileCache] = None
+# languages of the GitLab projects, cached along the backups, in the backup_path. Set up by run
+LANGUAGES_CACHE: Optional[JsonFileCache] = None
+
+
 class color_code(Enum):
     magenta = "\033[95m"
     blue = "\033[94m"
@@ -57,8 +182,12 @@ class ColorMeta(type):
         """
         if color_name in color_code.__members__:
             if stdout_supports_color():
-                return cls(color_code[color_name])
-            return cls(None)  # not format will be applied with a Color instanciated with None
+                color = cls(color_code[color_name])
+            else:
+                color = cls(None)  # not format will be applied with a Color instanciated with None
+            # set as a class attribute, so the next accesses to that color don't go through __getattr__ anymore
+            setattr(cls, color_name, color)
+            return color
         raise AttributeError(f"type object 'Color' has no attribute '{color_name}'")
 
 
@@ -86,8 +215,9 @@ class C(metaclass=ColorMeta):
         return f"{self.color_code.value}{message}{color_code.reset.value}"
 
 
+@functools.lru_cache(maxsize=1)
 def stdout_supports_color() -> bool:
-    """Check if the standard output supports color.
+    """Check if the standard output supports color. The result is computed once and then cached.
 
     Returns:
         bool: True if the standard output supports color, False otherwise.
@@ -109,6 +239,41 @@ def stdout_supports_color() -> bool:
     return False
 
 
+@contextlib.contextmanager
+def logging_through_queue():
+    """Route the root logger records through a queue while in the context.
+
+    The threads logging only enqueue their records, and a single listener thread writes them with the root handlers,
+    so the workers don't wait on each other for the output stream.
+    """
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    records_queue = queue.SimpleQueue()
+    listener = QueueListener(records_queue, *handlers, respect_handler_level=True)
+    root_logger.handlers = [QueueHandler(records_queue)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        root_logger.handlers = handlers
+
+
+@contextlib.contextmanager
+def logging_without_process_info():
+    """Don't gather the thread and process informations of the log records while in the context.
+
+    They are not used in the format, so there is no need to gather them for each record. The previous settings
+    are restored when leaving the context, not to alter the logging of an application calling run.
+    """
+    previous_flags = (logging.logThreads, logging.logProcesses, logging.logMultiprocessing)
+    logging.logThreads = logging.logProcesses = logging.logMultiprocessing = False
+    try:
+        yield
+    finally:
+        logging.logThreads, logging.logProcesses, logging.logMultiprocessing = previous_flags
+
+
 def log_errors(logger_function: Callable, errors: list[dict], header_message: str):
     level = logger_function.__name__
     if level == "warning":
@@ -128,45 +293,18 @@ def log_errors(logger_function: Callable, errors: list[dict], header_message: st
         print(head_color(" " * (37 + len(emoji)) + "_" * len(header_message)))
         logger_function(emoji + head_color(header_message))
     for error in errors:
-        logger_function(color(f"\t• {error['message']}"))
-
-
-def pass_trough(message: str, action: Callable):
-    global STDERR, STDOUT
-
-    temp_stdout, temp_stderr = sys.stdout, sys.stderr
-    temp_STDOUT, temp_STDERR = STDOUT, STDERR
-
-    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
-    STDOUT, STDERR = sys.__stdout__, sys.__stderr__
-
-    action(message)
-
-    sys.stdout, sys.stderr = temp_stdout, temp_stderr
-    STDOUT, STDERR = temp_STDOUT, temp_STDERR
-
-
-def shunt_stdout():
-    global STDOUT, STDERR
-    STDOUT = subprocess.DEVNULL
-    STDERR = subprocess.DEVNULL
-    sys.stdout = PRINT_BUFFER
-    sys.stderr = PRINT_BUFFER
-
-
-def restore_stdout():
-    global STDOUT, STDERR
-    sys.stdout = sys.__stdout__
-    sys.stderr = sys.__stderr__
-    STDOUT = sys.__stdout__
-    STDERR = sys.__stderr__
+        logger_function(color("\t• %s"), error["message"])
 
 
 class EmptyRemoteBranch(Exception):
     pass
 
 
-class GitLocalRepo(dict, ABC):
+class GitLocalRepo(ABC):
+
+    # only the few fields needed are kept from the platform's repository payload, in slots,
+    # to keep a small memory footprint per repository
+    __slots__ = ("local_path", "name", "archived", "clone_url")
 
     local_path: Path
     name: str
@@ -174,24 +312,22 @@ class GitLocalRepo(dict, ABC):
     clone_url: str
     messages_mapping = {"repo": "From repository : ", "branch": ", with ranch : ", "issue": ", with issue : "}
 
-    def __init__(self, *args, local_root: str | Path, **kwargs):
+    def __init__(self, payload: dict, *, local_root: str | Path):
         """Initialize the object with the given arguments.
 
         Args:
-            *args: Variable length argument list.
+            payload (dict): The repository informations, as provided by the platform's api.
             local_root (str): The local root path.
-            **kwargs: Arbitrary keyword arguments.
 
         Returns:
             None
         """
-        super().__init__(*args, **kwargs)
-        self.initiate()
+        self.initiate(payload)
         self.local_path = self.get_local_path(local_root)
 
     @abstractmethod
-    def initiate(self) -> None:
-        """Must initialize the Repo's atrtibutes name, archived and clone_url"""
+    def initiate(self, payload: dict) -> None:
+        """Must initialize the Repo's atrtibutes name, archived and clone_url from the payload"""
         ...
 
     @abstractmethod
@@ -264,12 +400,72 @@ class GitLocalRepo(dict, ABC):
 
         command: list[str] = ["git", *self.git_loc_prefix, *args] if target else ["git", *args]
         if out:
-            return subprocess.check_output(command, env=env).decode().splitlines()
-        return bool(subprocess.run(command, env=env, stdout=STDOUT, stderr=STDERR).returncode == 0)
+            return (
+                subprocess.check_output(command, env=env, stderr=GIT_OUTPUT, creationflags=GIT_CREATION_FLAGS)
+                .decode()
+                .splitlines()
+            )
+        if GIT_OUTPUT is None:
+            # the output is captured and logged as a single record, at the end of the command,
+            # not to interleave with the outputs of the commands running in the other threads
+            process = subprocess.run(
+                command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, creationflags=GIT_CREATION_FLAGS
+            )
+            if output := process.stdout.decode(errors="replace").rstrip():
+                logging.debug("%s : git %s\n%s", self.name, " ".join(args), output)
+            return process.returncode == 0
+        process = subprocess.run(
+            command, env=env, stdout=GIT_OUTPUT, stderr=GIT_OUTPUT, creationflags=GIT_CREATION_FLAGS
+        )
+        return process.returncode == 0
+
+    def git_iter(self, *args) -> Generator[str, None, None]:
+        """Run a git command on the local repository and yield its output lines, stripped, as they are written.
+
+        Args:
+            *args: Additional arguments to pass to the git command.
+
+        Yields:
+            str: The lines of the output of the command.
+
+        Raises:
+            subprocess.CalledProcessError: If the command exits with a non zero return code.
+        """
+        command = ["git", *self.git_loc_prefix, *args]
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=GIT_OUTPUT,
+            encoding="utf-8",
+            bufsize=1,
+            creationflags=GIT_CREATION_FLAGS,
+        ) as process:
+            for line in process.stdout:  # type: ignore
+                yield line.strip()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+
+    def git_raw(self, *args) -> bytes:
+        """Run a git command on the local repository and return its output as is, without decoding it.
+
+        Args:
+            *args: Additional arguments to pass to the git command.
+
+        Returns:
+            bytes: The raw output of the command.
+        """
+        return subprocess.check_output(
+            ["git", *self.git_loc_prefix, *args], stderr=GIT_OUTPUT, creationflags=GIT_CREATION_FLAGS
+        )
 
     def fetch_all(self):
-        """Fetch all branches and tags from the remote repository."""
-        self.git("fetch", "--all")
+        """Fetch all branches and tags from the remote repository.
+
+        All tags are fetched, including the ones that point outside of the branches (on deleted branches for example),
+        that git would not follow otherwise. The objects filter matching the configured clone_mode is applied,
+        so that partial clones stay partial.
+        """
+        self.git("fetch", "--all", "--tags", *FETCH_MODES_ARGS[CLONE_MODE])
 
     def set_active_branch(self, local_branch_name: str):
         """Set the active branch to the specified local branch name.
@@ -291,7 +487,8 @@ class GitLocalRepo(dict, ABC):
         Returns:
             None
         """
-        RESETED_BRANCHES.append(self.get_logging_info(branch=remote_branch_name.split("/", 1)[1]))
+        with REPORTS_LOCK:
+            RESETED_BRANCHES.append(self.get_logging_info(branch=remote_branch_name.split("/", 1)[1]))
         self.git("reset", "--hard", remote_branch_name)
 
     def pull_active_from(self, local_branch_name: str, remote_origin_name: str):
@@ -311,9 +508,7 @@ class GitLocalRepo(dict, ABC):
                 Defaults to True.
         """
         if no_merge_attempt:
-            env = os.environ.copy()
-            env["GIT_MERGE_AUTOEDIT"] = "false"
-            self.git("pull", "--no-ff", "--no-rebase", env=env)
+            self.git("pull", "--no-ff", "--no-rebase", env=PULL_ENV)
         else:
             self.git("pull")
 
@@ -331,54 +526,88 @@ class GitLocalRepo(dict, ABC):
         try:
             failed = self.pull_active()
         except subprocess.CalledProcessError as e:
-            print(e)
+            logging.debug("%s", e)
             failed = True
 
         if failed:
             self.reset_active_from(remote_branch_name)
 
-    def get_status_active(self):
-        status: list[str] = self.git("status", out=True)
-
-        status_maps = {
-            "synced": ["branch is up to date"],
-            "ahead": ["branch is ahead"],
-            "behind": ["branch is behind"],
-            "untracked": ["untracked files"],
-            "unstaged": ["changes not staged for commit"],
-            "uncommited": ["changes staged for commit", "changes to be committed"],
-            "merge_conflicts": ["unmerged", "merge conflict"],
-        }
+    def get_status_active(self) -> set[str]:
+        """Get the status of the active branch, from the machine readable output of git status.
+
+        Returns:
+            set[str]: The statuses found among : synced, ahead, behind, untracked, unstaged, uncommited
+                and merge_conflicts.
+        """
+        # entries are NUL separated and left undecoded, as only their first bytes are needed.
+        # This also avoids decoding file paths that may not be valid utf-8
+        entries = iter(self.git_raw("status", "--porcelain=v2", "--branch", "-z").split(b"\0"))
 
         statuses = set()
-        for line in status:
-            if "\t" in line:
-                continue
-            line = line.lower()
-            statuses.update(
-                [stat for stat, conditions in status_maps.items() if any([cond in line for cond in conditions])]
-            )
+        for entry in entries:
+            kind = entry[:2]
+            if match := BRANCH_AB_PATTERN.match(entry):
+                ahead, behind = int(match[1]), int(match[2])
+                if ahead:
+                    statuses.add("ahead")
+                if behind:
+                    statuses.add("behind")
+                if not ahead and not behind:
+                    statuses.add("synced")
+            elif kind == b"1 " or kind == b"2 ":
+                # second field is XY : X is the staged state, Y the unstaged one. A dot means unchanged.
+                if entry[2:3] != b".":
+                    statuses.add("uncommited")
+                if entry[3:4] != b".":
+                    statuses.add("unstaged")
+                if kind == b"2 ":
+                    # renamed or copied entries are followed by a separate entry containing the original path
+                    next(entries, None)
+            elif kind == b"u ":
+                statuses.add("merge_conflicts")
+            elif kind == b"? ":
+                statuses.add("untracked")
         return statuses
 
-    def get_local_branches(self) -> list:
-        """Get a list of local branches.
+    def get_refs_heads(self) -> tuple[dict[str, str], str]:
+        """Get the commits the local and remote branches point to, with a single git call.
 
         Returns:
-            list: A list of local branches.
+            tuple: A tuple containing two elements:
+                - A dict mapping the full reference names (refs/heads/... and refs/remotes/...) to commit hashes
+                - The name of the active local branch (empty if HEAD is detached)
         """
-        local_branches = self.git("branch", "--list", out=True)
-        return [branch.lstrip("* ").strip() for branch in local_branches]
-
-    def local_branch_exists(self, local_branch_name: str) -> bool:
-        """Check if a local branch exists.
+        refs_heads = {}
+        active_branch = ""
+        for line in self.git(
+            "for-each-ref", "--format=%(HEAD) %(objectname) %(refname)", "refs/heads/", "refs/remotes/", out=True
+        ):
+            # the first character is a star for the active branch, a space otherwise
+            objectname, refname = line[2:].split(" ", 1)
+            refs_heads[refname] = objectname
+            if line[0] == "*":
+                active_branch = refname.removeprefix("refs/heads/")
+        return refs_heads, active_branch
+
+    def remote_is_unchanged(self, remote_origin_name: str = "origin") -> bool:
+        """Check if every branch and tag of the remote already points to the same object in the local repository.
+
+        This only costs one network round trip to list the remote references, without fetching any object.
 
         Args:
-            local_branch_name (str): The name of the local branch to check.
+            remote_origin_name (str): The name of the remote to compare the local branches and tags against.
 
         Returns:
-            bool: True if the local branch exists, False otherwise.
+            bool: True if all remote branches and tags exist locally and are on the same object, False otherwise.
         """
-        return bool(self.git("branch", "--list", str(local_branch_name), out=True))
+        try:
+            remote_refs = set(self.git("ls-remote", "--heads", "--tags", "--refs", remote_origin_name, out=True))
+        except subprocess.CalledProcessError:
+            return False
+        local_refs = set(
+            self.git("for-each-ref", "--format=%(objectname)\t%(refname)", "refs/heads/", "refs/tags/", out=True)
+        )
+        return bool(remote_refs) and remote_refs.issubset(local_refs)
 
     def get_remote_branches(self):
         """Get the names of all remote branches.
@@ -389,19 +618,25 @@ class GitLocalRepo(dict, ABC):
                 - A list of remote branch names
                 - A list of remote names
         """
-        remote_branches = self.git("branch", "-r", out=True)
+        local_branches, remote_branches, remote_names = [], [], []
 
-        # Get names of all remote branches
-        remote_branches = [
-            branch.lstrip("* ").strip() for branch in remote_branches if len(branch) and "HEAD" not in branch
-        ]
-
-        # remove remote_name/ from branches to get the local name
-        # get remote_names of each remote branch if necessary
-        try:
-            remote_names, local_branches = zip(*[branch.split("/", 1) for branch in remote_branches])
-        except Exception as e:
-            raise EmptyRemoteBranch(f"Got error {e} when remote_branches value was : {remote_branches}")
+        # Get names of all remote branches, as git outputs them
+        for branch in self.git_iter("branch", "-r"):
+            branch = branch.lstrip("* ")
+            if not branch or "HEAD" in branch:
+                continue
+            # remove remote_name/ from branches to get the local name
+            # get remote_names of each remote branch if necessary
+            try:
+                remote_name, local_branch = branch.split("/", 1)
+            except ValueError as e:
+                raise EmptyRemoteBranch(f"Got error {e} when reading remote branch : {branch}")
+            local_branches.append(local_branch)
+            remote_branches.append(branch)
+            remote_names.append(remote_name)
+
+        if not remote_branches:
+            raise EmptyRemoteBranch("Got no remote branch to sync")
 
         return local_branches, remote_branches, remote_names
 
@@ -430,14 +665,26 @@ class GitLocalRepo(dict, ABC):
         Returns:
             None
         """
-        print(f"Updating {self.name} into {self.local_path}...")
+        logging.debug("Updating %s into %s...", self.name, self.local_path)
+
+        if self.remote_is_unchanged():
+            # nothing changed on the remote since the last sync, we skip the fetch and the per branch checks
+            return
 
         self.fetch_all()
+        refs_heads, active_branch = self.get_refs_heads()
 
-        # Pull updates for each local branch
+        # Pull updates for each local branch. This stays serial on purpose : all branches share the same
+        # working tree and index, so concurrent checkouts would race. Parallelism happens across repositories.
         for local_branch, remote_branch, origin_name in zip(*self.get_remote_branches()):
 
-            if self.local_branch_exists(local_branch):
+            local_head = refs_heads.get(f"refs/heads/{local_branch}", None)
+            if local_branch != active_branch and local_head == refs_heads.get(f"refs/remotes/{remote_branch}"):
+                # a branch that is not checked out cannot have local changes, so if it already points to the
+                # same commit as the remote, it is synced and we don't need to check it out to look at its status
+                continue
+
+            if local_head is not None:
                 # switches to local_branch as active branch
                 self.set_active_branch(local_branch)
             else:
@@ -458,10 +705,11 @@ class GitLocalRepo(dict, ABC):
                 # if the branch is just behind, then we try to pull and
                 self.pull_and_reset_branch_on_fail(remote_branch)
             else:
-                print(
+                logging.debug(
+                    "%s",
                     self.get_logging_info(
                         branch=local_branch, issue=f"Something strage happened, status of branch is {status}"
-                    )["message"]
+                    )["message"],
                 )
                 self.reset_active_from(remote_branch)
 
@@ -470,13 +718,15 @@ class GitLocalRepo(dict, ABC):
 
         This function clones the repository specified by the clone_url attribute into the local_path attribute.
         If the folder specified by local_path does not exist, it will be created.
+        The configured clone_mode selects between a full clone, a partial (treeless or blobless) clone,
+        or a shallow clone of all branches.
         """
-        print(f"Cloning {self.name} into {self.local_path}...")
+        logging.debug("Cloning %s into %s...", self.name, self.local_path)
         # Creating folder if it doesn't exist
         self.local_path.mkdir(parents=True, exist_ok=True)
 
         # Cloning the repo into it
-        self.git("clone", self.clone_url, str(self.local_path), target=False)
+        self.git("clone", *CLONE_MODES_ARGS[CLONE_MODE], self.clone_url, str(self.local_path), target=False)
 
     def sync(self):
         if not self.local_path.exists():
@@ -484,9 +734,11 @@ class GitLocalRepo(dict, ABC):
         try:
             self.sync_all_branches()
         except EmptyRemoteBranch as e:
-            FAILED_REPOS.append(self.get_logging_info(issue=f"EmptyRemoteBranch : {e}"))
+            with REPORTS_LOCK:
+                FAILED_REPOS.append(self.get_logging_info(issue=f"EmptyRemoteBranch : {e}"))
         except Exception as e:
-            FAILED_REPOS.append(self.get_logging_info(issue=f"UnknownError : {e}"))
+            with REPORTS_LOCK:
+                FAILED_REPOS.append(self.get_logging_info(issue=f"UnknownError : {e}"))
 
     @staticmethod
     def load_and_sync(repo_cls: type["GitPlatformRepo"], repository: dict, organization_name: str, local_root):
@@ -502,7 +754,7 @@ class GitLocalRepo(dict, ABC):
         repo = repo_cls(
             repository,
             local_root=Path(local_root) / organization_name,
-            language_mapping=LANGUAGE_MAPPING,
+            language_mapping=LANGUAGE_BY_KEYWORD,
             organisation=organization_name,
         )
         repo.sync()
@@ -511,6 +763,8 @@ class GitLocalRepo(dict, ABC):
 
 class GitPlatformRepo(GitLocalRepo):
 
+    __slots__ = ("topics", "language", "organisation", "language_mapping", "server")
+
     topics: list
     language: str
     organisation: str
@@ -522,7 +776,7 @@ class GitPlatformRepo(GitLocalRepo):
 
         Args:
             *args: Variable length argument list.
-            language_mapping (dict): A dictionary containing language mapping.
+            language_mapping (dict): A dictionary mapping lowercased topics or language names to a language.
             **kwargs: Arbitrary keyword arguments.
             kwargs must contain local_root with is needed by GitRepo class's __init__
         """
@@ -547,11 +801,7 @@ class GitPlatformRepo(GitLocalRepo):
 
         def scans_through_mapping(iterable: list[str]):
             return next(
-                (
-                    lang
-                    for lang, associated in self.language_mapping.items()
-                    if any((bool(element.lower() in associated) for element in iterable))
-                ),
+                (language for element in iterable if (language := self.language_mapping.get(element.lower()))),
                 None,
             )
 
@@ -561,35 +811,40 @@ class GitPlatformRepo(GitLocalRepo):
         if language is None and self.language is not None:
             language = scans_through_mapping([self.language])
             if language is None:
-                FAILED_MAPPINGS.append(
-                    self.get_logging_info(
-                        issue=f"current Topics : {self.topics} and current Main Language : '{self.language}' "
+                with REPORTS_LOCK:
+                    FAILED_MAPPINGS.append(
+                        self.get_logging_info(
+                            issue=f"current Topics : {self.topics} and current Main Language : '{self.language}' "
+                        )
                     )
-                )
 
         return language if language is not None else "others"
 
 
 class GithubRepo(GitPlatformRepo):
 
-    def initiate(self):
+    __slots__ = ()
+
+    def initiate(self, payload: dict):
         """Initializes the object with the provided attributes."""
-        self.name = self["name"]
-        self.archived = self["archived"]
-        self.clone_url = self["clone_url"]
-        self.topics = self["topics"]
-        self.language = self["language"]
+        self.name = payload["name"]
+        self.archived = payload["archived"]
+        self.clone_url = payload["clone_url"]
+        self.topics = payload["topics"]
+        self.language = payload["language"]
 
 
 class GitlabRepo(GitPlatformRepo):
 
-    def initiate(self):
+    __slots__ = ()
+
+    def initiate(self, payload: dict):
         """Initializes the object with the provided attributes."""
-        self.name = str(self["name"]).replace(" ", "")
-        self.archived = self["archived"]
-        self.clone_url = self["http_url_to_repo"]
-        self.topics = self["topics"]
-        self.language = self["language"]
+        self.name = str(payload["name"]).replace(" ", "")
+        self.archived = payload["archived"]
+        self.clone_url = payload["http_url_to_repo"]
+        self.topics = payload["topics"]
+        self.language = payload["language"]
 
 
 class PlatformApi:
@@ -597,6 +852,136 @@ class PlatformApi:
     username: str
     token: str
     root_url: str
+    session: requests.Session
+    executor: Optional[ThreadPoolExecutor] = None
+    page_size = 100
+
+    def __init__(self, username, token):
+        """Initializes the credentials, and the http session shared by all the requests to the platform.
+
+        Args:
+            username (str): The username to be assigned.
+            token (str): The token to be assigned.
+        """
+        self.username = username
+        self.token = token
+        self.session = self.new_session()
+
+    def close(self):
+        """Close the http session, and the connections it kept alive."""
+        self.session.close()
+
+    @staticmethod
+    def new_session() -> requests.Session:
+        """Create an http session keeping its connections alive, to avoid a new TCP and TLS handshake per request.
+
+        Requests failing with a 502, 503 or 504 status are retried up to 3 times.
+
+        Returns:
+            requests.Session: The session, with a connection pool large enough for the concurrent workers.
+        """
+        session = requests.Session()
+        # transient gateway errors are retried, the last response is returned as is if they keep failing
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(
+            pool_connections=MAX_PENDING_REQUESTS, pool_maxsize=MAX_PENDING_REQUESTS, max_retries=retries
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def fetch_remaining_pages(self, fetch_page: Callable[[int], list], first_page: int, last_page: int) -> list:
+        """Fetch a range of pages concurrently, once the number of pages is known from the first one.
+
+        Pages are submitted to the platform's executor if one was given, otherwise to a temporary pool.
+
+        Args:
+            fetch_page (Callable[[int], list]): The function returning the elements of a given page number.
+            first_page (int): The first page number to fetch.
+            last_page (int): The last page number to fetch, included.
+
+        Returns:
+            list: The elements of all the pages, in the pages order.
+        """
+        elements = []
+        pages = range(first_page, last_page + 1)
+        if not pages:
+            return elements
+
+        if self.executor is None:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pages))) as pages_pool:
+                for page_elements in pages_pool.map(fetch_page, pages):
+                    elements.extend(page_elements)
+            return elements
+
+        jobs = [(page, self.executor.submit(fetch_page, page)) for page in pages]
+        for page, job in jobs:
+            # we may be running inside a worker of that same executor. To never wait on jobs queued behind us,
+            # the pages that no worker started yet are cancelled and fetched by the current thread instead.
+            elements.extend(fetch_page(page) if job.cancel() else job.result())
+        return elements
+
+    def fetch_following_pages(self, fetch_page: Callable[[int], list], elements: list, last_page: int) -> list:
+        """Fetch the pages after the last known one, one after the other, for as long as the last page is full.
+
+        The last page is only known to be the last one if it is not full : the number of pages may come from
+        headers cached on a previous run, or not be provided at all by the server.
+
+        Args:
+            fetch_page (Callable[[int], list]): Function fetching the elements of a page, from its number.
+            elements (list): The elements of all the pages up to the last known one, extended in place.
+            last_page (int): The number of the last known page.
+
+        Returns:
+            list: The elements, with the ones of the following pages.
+        """
+        page = last_page
+        # all pages before the last one are full, so the last one is full if the total is a multiple of the page size
+        while len(elements) == page * self.page_size:
+            page += 1
+            elements.extend(fetch_page(page))
+        return elements
+
+    def get_json(self, url: str, use_etag: bool = True) -> tuple[Any, CaseInsensitiveDict]:
+        """Get and decode the json content of an url.
+
+        If that url was already fetched on a previous run, the request is made conditional on its ETag.
+        The server then answers with an empty 304 response if nothing changed, and the cached content is used.
+        (on GitHub, these conditional requests don't count in the rate limit)
+
+        Args:
+            url (str): The url to get.
+            use_etag (bool, optional): Whether to make the request conditional and cache the response with its ETag.
+                Defaults to True. Disabled for the contents already cached elsewhere.
+
+        Returns:
+            tuple: A tuple containing two elements:
+                - The decoded content, or None if the request failed
+                - The headers of the response. For a cached content, only the pagination headers are kept.
+        """
+        cache_key = f"{self.username}@{url}"
+        cached = ETAGS_CACHE.get(cache_key) if ETAGS_CACHE is not None and use_etag else None
+        request_headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+        response = self.session.get(url, headers=request_headers, timeout=30)
+        pagination_headers = {
+            name: response.headers[name] for name in ("Link", "X-Total-Pages") if name in response.headers
+        }
+        if response.status_code == 304 and cached:
+            # the number of pages can change while this page stays the same : the pagination headers
+            # of the 304 response are used, and cached, when the server provides them
+            if pagination_headers and pagination_headers != cached["headers"]:
+                ETAGS_CACHE.set(cache_key, {**cached, "headers": pagination_headers})  # type: ignore
+            return json_loads(cached["body"]), CaseInsensitiveDict(pagination_headers or cached["headers"])
+        if response.status_code != 200:
+            logging.error("Error: %s - %s", response.status_code, response.text)
+            return None, response.headers
+
+        data = json_loads(response.content)
+        if ETAGS_CACHE is not None and use_etag and (etag := response.headers.get("ETag", None)):
+            # the raw body is cached rather than the decoded data, so callers can't alter the cached content
+            ETAGS_CACHE.set(cache_key, {"etag": etag, "body": response.text, "headers": pagination_headers})
+        return data, response.headers
 
     @abstractmethod
     def get_all_repos_mapping_from_executors(
@@ -623,36 +1008,50 @@ class GitHubApi(PlatformApi):
             token (str): The token to be assigned.
         """
 
-        self.username = username
-        self.token = token
+        super().__init__(username, token)
         self.visibility = visibility
+        self.session.auth = (self.username, self.token)
+
+    def fetch_page(self, endpoint, page: int) -> tuple[list[dict], int]:
+        """Fetch a single page of data from the specified endpoint.
+
+        Args:
+            endpoint (str): The endpoint to fetch data from.
+            page (int): The number of the page to fetch.
+
+        Returns:
+            tuple: A tuple containing two elements:
+                - A list of elements fetched from the page (empty if the request failed)
+                - The number of the last page available, read from the Link header of the response
+        """
+        url = f"{self.root_url}/{endpoint}?visibility={self.visibility}&per_page={self.page_size}&page={page}"
+        data, headers = self.get_json(url)
+        if data is None:
+            return [], page
+        last_page = page
+        for link in parse_header_links(headers.get("Link", "")):
+            if link.get("rel", None) == "last":
+                last_page = int(parse_qs(urlparse(link["url"]).query)["page"][0])
+        return data, last_page
 
     def fetch(self, endpoint) -> list[dict]:
         """Fetch data from the specified endpoint.
 
+        The first page tells how many pages there are, the other ones are then fetched concurrently.
+
         Args:
             endpoint (str): The endpoint to fetch data from.
 
         Returns:
             list: A list of elements fetched from the endpoint.
         """
-        elements = []
-        page = 1
-        while True:
-            url = f"{self.root_url}/{endpoint}?visibility={self.visibility}&per_page=100&page={page}"
-            response = requests.get(url, auth=(self.username, self.token))
-            if response.status_code != 200:
-                break
-            data = response.json()
-            if not data:
-                break
-            elements.extend(data)
-            page += 1
-        return elements
+        elements, last_page = self.fetch_page(endpoint, 1)
+        elements.extend(self.fetch_remaining_pages(lambda page: self.fetch_page(endpoint, page)[0], 2, last_page))
+        return self.fetch_following_pages(lambda page: self.fetch_page(endpoint, page)[0], elements, last_page)
 
     def get_user_orgs(self) -> list[dict]:
         """Fetch all organizations the authenticated user is a member of."""
-        print(f"Getting user organizations for {self.username}")
+        logging.debug("Getting user organizations for %s", self.username)
         return self.fetch(endpoint="user/orgs")
 
     def get_user_repositories(self) -> list[dict]:
@@ -681,7 +1080,7 @@ class GitHubApi(PlatformApi):
             TypeError: If the organization is not a string or a dictionary with a 'login' key.
         """
         organization_name = self.get_organization_name(organization)
-        print(f"Getting organisation repositories for {organization_name}")
+        logging.debug("Getting organisation repositories for %s", organization_name)
         return self.fetch(endpoint=f"orgs/{organization_name}/repos")
 
     def get_organization_name(self, organization: dict | str) -> str:
@@ -736,14 +1135,7 @@ class GitHubApi(PlatformApi):
             list[tuple[str, dict]]: A filtered list of tuples containing organization names and repository dictionaries.
         """
 
-        def is_repo_included(element):
-            org_name, repo = element
-            combined_name = f"{org_name}/{repo['name']}"
-            if combined_name in EXCLUDE_REPOS:
-                return False
-            return True
-
-        return list(filter(is_repo_included, mapping))
+        return [(org_name, repo) for org_name, repo in mapping if repo["name"] not in EXCLUDE_BY_ORG.get(org_name, ())]
 
     def get_all_repos_mapping_from_executors(
         self, executor_pool: ThreadPoolExecutor
@@ -758,6 +1150,7 @@ class GitHubApi(PlatformApi):
         """
 
         # reading the repos and organizations repos available for the user, over http, on multiple threads
+        self.executor = executor_pool
         user_orgs_job = executor_pool.submit(self.get_user_orgs)
         repo_job = [
             executor_pool.submit(self.get_repos_mapping, organisation) for organisation in user_orgs_job.result()
@@ -782,58 +1175,64 @@ class GitLabApi(PlatformApi):
             username (str): The username to be assigned.
             token (str): The token to be assigned.
         """
-        self.username = username
-        self.token = token
+        super().__init__(username, token)
         self.root_url = f"https://{server}/api/v{api_version}"
+        self.session.headers["PRIVATE-TOKEN"] = self.token
+
+    def fetch_page(self, endpoint, *args, page: int) -> tuple[list, Optional[int]]:
+        """Fetch a single page of data from the specified endpoint.
+
+        Args:
+            endpoint (str): The endpoint to fetch data from.
+            *args: The query arguments, formated as "key=value".
+            page (int): The number of the page to fetch.
 
-    def fetch(self, endpoint, *args, no_pages=False):
+        Returns:
+            tuple: A tuple containing two elements:
+                - The data fetched (an empty list if the request failed)
+                - The total number of pages, read from the X-Total-Pages header, or None if it is not provided.
+        """
+        arguments = list(args) + [f"per_page={self.page_size}", f"page={page}"]
+        url = f"{self.root_url}/{endpoint}?{'&'.join(arguments)}"
+        data, headers = self.get_json(url)
+        if data is None:
+            return [], 0
+        total_pages = headers.get("X-Total-Pages", None)
+        return data, int(total_pages) if total_pages else None
+
+    def fetch(self, endpoint, *args):
         """Fetch data from the specified endpoint.
 
+        The first page tells how many pages there are, the other ones are then fetched concurrently.
+        (GitLab omits the total for very large collections, in which case pages are fetched one after the other)
+
         Args:
             endpoint (str): The endpoint to fetch data from.
 
         Returns:
             list: A list of elements fetched from the endpoint.
         """
-        elements = []
-        page = 1
-        while True:
-            if no_pages:
-                arguments = "&".join(list(args))
-            else:
-                arguments = "&".join(list(args) + ["per_page=100", f"page={page}"])
-            url = f"{self.root_url}/{endpoint}?{arguments}"
-            headers = {"PRIVATE-TOKEN": self.token}
-            response = requests.get(url, headers=headers, timeout=30)
-            if response.status_code != 200:
-                print(f"Error: {response.status_code} - {response.text}")
-                break
-            data = response.json()
-            if no_pages:
-                elements = data
-                break
-            if not data:
-                if no_pages:
-                    continue
-                else:
-                    break
-            else:
-                if no_pages:
-                    elements = data
-                    break
-                else:
-                    elements.extend(data)
-            page += 1
-        return elements
+        data, total_pages = self.fetch_page(endpoint, *args, page=1)
+        elements = list(data)
+        if total_pages:
+            elements.extend(
+                self.fetch_remaining_pages(lambda page: self.fetch_page(endpoint, *args, page=page)[0], 2, total_pages)
+            )
+        # without a total, the pages are fetched one after the other, until one is not filled up
+        return self.fetch_following_pages(
+            lambda page: self.fetch_page(endpoint, *args, page=page)[0], elements, total_pages or 1
+        )
 
     def get_user_orgs(self):
         """Fetch all groups the authenticated user is a member of."""
-        print(f"Getting user groups for {self.username}")
+        logging.debug("Getting user groups for %s", self.username)
         return self.fetch(endpoint="groups")
 
     def get_user_repositories(self):
         """Fetches projects of the user.
 
+        The full path of the group of each project is parsed once here, and stored in its "_org_name" key.
+
         Returns:
             List: A list of projects belonging to the user.
         """
@@ -841,7 +1240,10 @@ class GitLabApi(PlatformApi):
             f'🌐  {C.blue(f"Getting user projects for")} {C.yellow(self.username)} '
             f'{C.blue("from")} {C.cyan(self.root_url)}'
         )
-        return self.fetch("projects", "owned=true")
+        repositories = self.fetch("projects", "owned=true")
+        for repository in repositories:
+            repository["_org_name"] = self.get_project_organization_name(repository)
+        return repositories
 
     # def get_group_projects(self, group_id):
     #     """Get projects of a specific group.
@@ -857,7 +1259,7 @@ class GitLabApi(PlatformApi):
 
     def get_organization_name(self, repository: dict | str) -> str:
         if isinstance(repository, dict):
-            organization_name = str(repository["name_with_namespace"]).replace(" ", "").rsplit("/", 1)[0]
+            organization_name = repository["_org_name"]
         elif isinstance(repository, str):
             organization_name = repository
         else:
@@ -866,14 +1268,40 @@ class GitLabApi(PlatformApi):
             )
         return organization_name
 
-    def get_languages(self, repository_id: str) -> dict:
-        languages: dict = self.fetch(f"projects/{repository_id}/languages", no_pages=True)  # type: ignore
-        if len(languages):
-            language = list(languages.keys())[list(languages.values()).index(max(languages.values()))]
-        else:
-            language = ""
+    @staticmethod
+    def get_project_organization_name(repository: dict) -> str:
+        """Get the full path of the group a project belongs to, from the project informations.
+
+        Args:
+            repository (dict): The project informations, as provided by the api.
+
+        Returns:
+            str: The groups names, without spaces, separated by slashes.
+        """
+        return str(repository["name_with_namespace"]).replace(" ", "").rsplit("/", 1)[0]
+
+    def get_languages(self, repository: dict) -> dict:
+        # the languages of a project only change with its activity, so they are cached until it gets new activity
+        cache_key = f"{self.root_url}/projects/{repository['id']}"
+        last_activity = repository.get("last_activity_at", None)
+        if LANGUAGES_CACHE is not None and last_activity is not None:
+            cached = LANGUAGES_CACHE.get(cache_key)
+            if cached is not None and cached["last_activity_at"] == last_activity:
+                return {"languages": cached["languages"], "language": cached["language"]}
+
+        # the languages are already cached in LANGUAGES_CACHE, they are not stored a second time in the ETags cache
+        languages, _ = self.get_json(f"{self.root_url}/projects/{repository['id']}/languages", use_etag=False)
+        if languages is None:
+            languages = []
+        language = max(languages, key=languages.get) if languages else ""
         # repository.update(languages=languages, language=language)
         # print(f"Got languages for {repository['name_with_namespace']}")
+
+        # a failed request gives an empty list instead of a dict, it is not cached so that it is retried next time
+        if LANGUAGES_CACHE is not None and last_activity is not None and isinstance(languages, dict):
+            LANGUAGES_CACHE.set(
+                cache_key, {"last_activity_at": last_activity, "languages": languages, "language": language}
+            )
         return {"languages": languages, "language": language}
 
     def get_repos_mapping(self, organization: str = "") -> list[tuple[str, dict]]:
@@ -885,58 +1313,120 @@ class GitLabApi(PlatformApi):
         Returns:
             list[tuple[str, dict]]: A list of tuples containing the group name and project information.
         """
-        return self.filter_repos(
-            [(self.get_organization_name(repository), repository) for repository in self.get_user_repositories()]
-        )
+        return [
+            (self.get_organization_name(repository), repository)
+            for repository in self.get_user_repositories()
+            if not self.is_excluded(repository)
+        ]
 
-    def filter_repos(self, mapping: list[tuple[str, dict]]) -> list[tuple[str, dict]]:
-        """Filters out projects based on exclusion list.
+    @staticmethod
+    def is_excluded(repository: dict) -> bool:
+        """Check if a project is in the exclusion list.
 
         Args:
-            mapping (list[tuple[str, dict]]): A list of tuples where each tuple contains a group name
-                and a dictionary representing a project.
+            repository (dict): The project information, as provided by the api.
 
         Returns:
-            list[tuple[str, dict]]: A filtered list of tuples containing group names and project dictionaries.
+            bool: True if the project path, without spaces and lowercased, is in the excluded repositories.
         """
-
-        def is_repo_included(element):
-            organization_name, repository = element
-            combined_name = repository["path_with_namespace"].replace(" ", "").lower()
-            if combined_name in EXCLUDE_REPOS:
-                return False
-            return True
-
-        return list(filter(is_repo_included, mapping))
+        return repository["path_with_namespace"].replace(" ", "").lower() in EXCLUDE_REPOS
 
     def get_all_repos_mapping_from_executors(
         self, executor_pool: ThreadPoolExecutor
     ) -> Generator[tuple[type[GitPlatformRepo], str, dict], None, None]:
 
-        def is_repo_included(repository):
-            combined_name = repository["path_with_namespace"].replace(" ", "")
-            if combined_name in EXCLUDE_REPOS:
-                return False
-            return True
+        self.executor = executor_pool
+        # excluded projects are filtered out before requesting their languages, to not waste requests on them
+        repos_mapping = [repository for repository in self.get_user_repositories() if not self.is_excluded(repository)]
+        return self.iter_repos_with_languages(repos_mapping, executor_pool)
+
+    def iter_repos_with_languages(
+        self, repositories: list[dict], executor_pool: ThreadPoolExecutor
+    ) -> Generator[tuple[type[GitPlatformRepo], str, dict], None, None]:
+        """Get the languages of the projects on multiple threads, and yield the projects as their languages arrive.
 
-        repos_mapping = self.get_user_repositories()
-        repos_lang_jobs = {executor_pool.submit(self.get_languages, repo["id"]): repo for repo in repos_mapping}
+        At most MAX_PENDING_REQUESTS languages requests are submitted at a time, the next ones being submitted
+        as the previous ones complete, to avoid holding a future per project and bursting the api rate limit.
 
-        return (
-            (
-                self.repo_class,
-                self.get_organization_name(repos_lang_jobs[job]),
-                dict(**repos_lang_jobs[job], **job.result()),
-            )
-            for job in as_completed(repos_lang_jobs)
-            if is_repo_included(repos_lang_jobs[job])
-        )
+        Args:
+            repositories (list[dict]): The projects informations, as provided by the api.
+            executor_pool (ThreadPoolExecutor): The ThreadPoolExecutor instance to execute the requests.
+
+        Yields:
+            tuple: The repo class, the group name, and the project informations completed with its languages.
+        """
+
+        def completed_jobs():
+            done_jobs, _ = wait(pending_jobs, return_when=FIRST_COMPLETED)
+            for job in done_jobs:
+                repository = pending_jobs.pop(job)
+                yield (self.repo_class, repository["_org_name"], dict(**repository, **job.result()))
+
+        pending_jobs: dict[Future, dict] = {}
+        for repository in repositories:
+            pending_jobs[executor_pool.submit(self.get_languages, repository)] = repository
+            if len(pending_jobs) >= MAX_PENDING_REQUESTS:
+                yield from completed_jobs()
+        while pending_jobs:
+            yield from completed_jobs()
+
+
+def merge_generators(generator_factories: list[Callable[[], Iterable]]) -> Generator:
+    """Yield the items of several generators in the order they are produced, each generator being created
+    and consumed by its own thread, so that a slow generator doesn't hold back the items of the others.
 
+    The generators are given as factories, and not as already created generators, for the work done
+    when creating them to also happen in the producer threads, and not one after the other in the calling thread.
 
-def run(level="INFO"):
+    Args:
+        generator_factories (list[Callable[[], Iterable]]): Callables returning the generators to consume.
+
+    Raises:
+        Exception: The first exception raised by one of the generators, re-raised in the consuming thread.
+
+    Yields:
+        Any: The items of all the generators.
+    """
+    items_queue = queue.SimpleQueue()
+    # put by each producer thread once its generator is exhausted, or failed
+    finished = object()
+
+    def produce(generator_factory: Callable[[], Iterable]):
+        try:
+            for item in generator_factory():
+                items_queue.put((item, None))
+        except Exception as error:
+            items_queue.put((None, error))
+        finally:
+            items_queue.put(finished)
+
+    for index, generator_factory in enumerate(generator_factories):
+        threading.Thread(target=produce, args=(generator_factory,), name=f"producer_{index}", daemon=True).start()
+
+    remaining_producers = len(generator_factories)
+    while remaining_producers:
+        entry = items_queue.get()
+        if entry is finished:
+            remaining_producers -= 1
+            continue
+        item, error = entry
+        if error is not None:
+            raise error
+        yield item
+
+
+def run(level="INFO", executor: Optional[ThreadPoolExecutor] = None):
+    """Synchronize all the repositories of the configured platforms into the backup path.
+
+    Args:
+        level (str, optional): The logging level. Defaults to "INFO".
+        executor (Optional[ThreadPoolExecutor], optional): The pool on which the git syncs are run. It is left
+            running at the end, to reuse its threads when run is called repeatedly from the same process.
+            Defaults to None, in which case a pool of MAX_WORKERS threads is created for this run only.
+    """
+    global GIT_OUTPUT, ETAGS_CACHE, LANGUAGES_CACHE
 
-    with open(Path(__file__).parent.parent.parent / ".secret_config.toml", "rb") as f:
-        config = tomllib.load(f)
+    config = load_config()
 
     backup_path = process_config(config)
 
@@ -944,44 +1434,81 @@ def run(level="INFO"):
     logging.basicConfig(level=level, format="%(asctime)s - %(levelname)-8s # %(message)s")
     logger = logging.getLogger()
 
+    GIT_OUTPUT = None if level == "DEBUG" else subprocess.DEVNULL
+    ETAGS_CACHE = JsonFileCache(ETAGS_CACHE_PATH)
+    LANGUAGES_CACHE = JsonFileCache(Path(backup_path) / ".languages_cache.json")
+
+    # the reports of a previous run in the same process are not reported again
+    with REPORTS_LOCK:
+        RESETED_BRANCHES.clear()
+        FAILED_REPOS.clear()
+        FAILED_MAPPINGS.clear()
+
     platforms = [PlatformApi.from_config(conf) for conf in config.get("platforms", [])]
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor_pool:
+    # the platforms api requests are light and quick, while the git syncs are long and heavy on disk and network,
+    # so they are run on separate pools, for the api requests not to wait behind the syncs.
+    # the api pool has as many threads as kept alive connections per session : more threads would only wait
+    # on the connections, or open new ones that get discarded right after their request
+    with (
+        contextlib.ExitStack() as stack,
+        logging_without_process_info(),
+        logging_through_queue(),
+        ThreadPoolExecutor(max_workers=MAX_PENDING_REQUESTS, thread_name_prefix="meta") as meta_pool,
+    ):
+
+        if executor is None:
+            sync_pool = stack.enter_context(ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="sync"))
+            sync_pool_message = (
+                f'{C.blue("Splitting sync tasks between")} {C.green(str(MAX_WORKERS))} {C.blue("threads.")}'
+            )
+        else:
+            sync_pool = executor
+            sync_pool_message = C.blue("Running sync tasks on the given executor.")
 
-        if not level == "DEBUG":
-            shunt_stdout()
+        # the platforms sessions are closed when leaving the block, once all their requests are done
+        for platform in platforms:
+            stack.enter_context(contextlib.closing(platform))
 
-        generators = [platform.get_all_repos_mapping_from_executors(executor_pool) for platform in platforms]
-        repositories = [item for generator in generators for item in generator]
+        # the platforms are listed from the producer threads of merge_generators, all at once
+        generator_factories = [
+            functools.partial(platform.get_all_repos_mapping_from_executors, meta_pool) for platform in platforms
+        ]
 
-        restore_stdout()
+        # synchronizing the repos with the drive, as they get available : the sync of the first repos found
+        # starts while the next ones are still being read from the platforms, all platforms being read at once
+        pending_jobs = {
+            sync_pool.submit(GitPlatformRepo.load_and_sync, cls, repository, organisation, backup_path)
+            for cls, organisation, repository in merge_generators(generator_factories)
+        }
+        ETAGS_CACHE.save()
+        LANGUAGES_CACHE.save()
 
         logger.info(
-            f'🔎  {C.blue("Found")} {C.green(str(len(repositories)))} '
-            f'{C.blue("repos to synchronize. Splitting sync tasks between")} '
-            f'{C.green(str(MAX_WORKERS))} {C.blue("threads.")}'
+            f'🔎  {C.blue("Found")} {C.green(str(len(pending_jobs)))} {C.blue("repos to synchronize.")} '
+            f"{sync_pool_message}"
         )
 
-        if not level == "DEBUG":
-            shunt_stdout()
-
-        # synchronizing the repos with the drive, as they get available
-        sync_jobs = [
-            executor_pool.submit(GitPlatformRepo.load_and_sync, cls, repository, organisation, backup_path)
-            for cls, organisation, repository in repositories
-        ]
-
-        for job in as_completed(sync_jobs):
-            result = job.result()
-            logger.info(
-                f'✅  {C.blue("Finished synchronizing")} {C.magenta(result["repo"])} {C.blue("in")} '
-                f'{C.yellow(result["org"])} {C.blue("from")} {C.cyan(result["api_url"])}'
-            )
-
-    restore_stdout()
+        # the static colored parts of the completion message are assembled once, not for each repository
+        finished_template = f'✅  {C.blue("Finished synchronizing")} %s {C.blue("in")} %s {C.blue("from")} %s'
+
+        # finished jobs are dropped from the pending set as soon as they are logged,
+        # for their results not to be kept in memory until the end of the run
+        completed_count = 0
+        while pending_jobs:
+            done_jobs, pending_jobs = wait(pending_jobs, return_when=FIRST_COMPLETED)
+            for job in done_jobs:
+                result = job.result()
+                completed_count += 1
+                logger.info(
+                    finished_template,
+                    C.magenta(result["repo"]),
+                    C.yellow(result["org"]),
+                    C.cyan(result["api_url"]),
+                )
 
     logger.info(
-        f'🎉  {C.blue("Completed synchronization for")} {C.green(str(len(sync_jobs)))} {C.blue("repositories.")}🔐'
+        f'🎉  {C.blue("Completed synchronization for")} {C.green(str(completed_count))} {C.blue("repositories.")}🔐'
     )
 
     log_errors(logger.error, RESETED_BRANCHES, "Reseted the branches :")
@@ -0,0 +1,104 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from git_backuper.git_backuper import GitLocalRepo
+
+GIT_IDENTITY = ["-c", "user.name=tester", "-c", "user.email=tester@example.com"]
+
+
+def git(*args, cwd: Path) -> str:
+    return subprocess.check_output(["git", *GIT_IDENTITY, *args], cwd=cwd, stderr=subprocess.DEVNULL).decode().strip()
+
+
+class LocalRepo(GitLocalRepo):
+    __slots__ = ()
+
+    def initiate(self, payload: dict):
+        self.name = payload["name"]
+        self.archived = False
+        self.clone_url = payload["clone_url"]
+
+    def get_language(self) -> str:
+        return "others"
+
+
+@pytest.fixture
+def remote(tmp_path: Path) -> tuple[Path, Path]:
+    """A bare remote repository with one commit on main, and a working clone used to push to it."""
+    bare = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    git("init", "--bare", "-b", "main", str(bare), cwd=tmp_path)
+    git("clone", str(bare), str(work), cwd=tmp_path)
+    (work / "file.txt").write_text("content")
+    git("add", "file.txt", cwd=work)
+    git("commit", "-m", "initial", cwd=work)
+    git("push", "origin", "HEAD:main", cwd=work)
+    return bare, work
+
+
+def test_sync_fetches_tag_only_changes(tmp_path: Path, remote: tuple[Path, Path]):
+    bare, work = remote
+    repo = LocalRepo({"name": "repo", "clone_url": bare.as_uri()}, local_root=tmp_path / "backup")
+    repo.sync()
+    assert repo.remote_is_unchanged()
+
+    # a tag on an existing commit moves no branch, but must still be backed up
+    git("tag", "-a", "v1.0", "-m", "release", cwd=work)
+    git("push", "origin", "v1.0", cwd=work)
+
+    assert not repo.remote_is_unchanged()
+    repo.sync()
+    assert git("tag", "--list", cwd=repo.local_path) == "v1.0"
+    assert repo.remote_is_unchanged()
+
+    # a tag on a commit that no branch contains anymore is not followed by a plain fetch
+    git("checkout", "-b", "feature", cwd=work)
+    (work / "feature.txt").write_text("feature")
+    git("add", "feature.txt", cwd=work)
+    git("commit", "-m", "feature", cwd=work)
+    git("tag", "v1.1-feature", cwd=work)
+    git("push", "origin", "v1.1-feature", cwd=work)
+
+    assert not repo.remote_is_unchanged()
+    repo.sync()
+    assert git("tag", "--list", cwd=repo.local_path).split() == ["v1.0", "v1.1-feature"]
+    assert repo.remote_is_unchanged()
+
+
+@pytest.mark.parametrize(
+    ("entries", "expected"),
+    [
+        ([b"# branch.oid 0123", b"# branch.head main", b"# branch.ab +0 -0"], {"synced"}),
+        ([b"# branch.ab +2 -0"], {"ahead"}),
+        ([b"# branch.ab +0 -3"], {"behind"}),
+        ([b"# branch.ab +1 -1"], {"ahead", "behind"}),
+        ([b"# branch.ab +0 -0", b"1 .M N... 100644 100644 100644 0123 0123 file.txt"], {"synced", "unstaged"}),
+        ([b"# branch.ab +0 -0", b"1 M. N... 100644 100644 100644 0123 4567 file.txt"], {"synced", "uncommited"}),
+        ([b"u UU N... 100644 100644 100644 100644 0123 4567 89ab file.txt"], {"merge_conflicts"}),
+        ([b"? new file.txt"], {"untracked"}),
+        # the original path of a renamed entry is a separate entry, that must not be parsed as a status line
+        ([b"2 R. N... 100644 100644 100644 0123 0123 R100 new.txt", b"? original.txt"], {"uncommited"}),
+        # paths are left undecoded, they don't have to be valid utf-8
+        ([b"? \xff\xfe.txt"], {"untracked"}),
+    ],
+)
+def test_get_status_active_parsing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, entries, expected):
+    repo = LocalRepo({"name": "repo", "clone_url": ""}, local_root=tmp_path)
+    monkeypatch.setattr(LocalRepo, "git_raw", lambda self, *args: b"\0".join(entries) + b"\0")
+    assert repo.get_status_active() == expected
+
+
+def test_get_status_active_on_a_repository(tmp_path: Path, remote: tuple[Path, Path]):
+    bare, work = remote
+    repo = LocalRepo({"name": "repo", "clone_url": bare.as_uri()}, local_root=tmp_path / "backup")
+    repo.sync()
+    assert repo.get_status_active() == {"synced"}
+
+    (repo.local_path / "file.txt").write_text("changed")
+    (repo.local_path / "untracked.txt").write_text("new")
+    assert repo.get_status_active() == {"synced", "unstaged", "untracked"}
+
+    git("commit", "-am", "local change", cwd=repo.local_path)
+    assert repo.get_status_active() == {"ahead", "untracked"}
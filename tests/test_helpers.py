@@ -0,0 +1,58 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from git_backuper.git_backuper import JsonFileCache, merge_generators
+
+
+def test_json_file_cache_round_trip(tmp_path: Path):
+    path = tmp_path / "sub" / "cache.json"
+    cache = JsonFileCache(path)
+    assert cache.data == {}
+
+    cache.set("url", {"etag": '"abc"', "body": "[1, 2]", "headers": {"Link": "<url>"}})
+    cache.set("unicode", "é")
+    cache.save()
+
+    assert path.exists() and not path.with_suffix(".tmp").exists()
+    reloaded = JsonFileCache(path)
+    assert reloaded.get("url") == {"etag": '"abc"', "body": "[1, 2]", "headers": {"Link": "<url>"}}
+    assert reloaded.get("unicode") == "é"
+    assert reloaded.get("missing", 0) == 0
+
+
+def test_json_file_cache_ignores_a_corrupted_file(tmp_path: Path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    assert JsonFileCache(path).data == {}
+
+
+def test_merge_generators_yields_all_items():
+    generator_factories = [lambda: iter(range(3)), lambda: iter(range(10, 12)), lambda: iter(())]
+    assert sorted(merge_generators(generator_factories)) == [0, 1, 2, 10, 11]
+
+
+def test_merge_generators_creates_the_generators_in_producer_threads():
+    main_thread = threading.current_thread()
+
+    def generator_factory():
+        # the work done when creating the generator must not happen in the consuming thread
+        yield threading.current_thread() is not main_thread
+
+    assert list(merge_generators([generator_factory, generator_factory])) == [True, True]
+
+
+def test_merge_generators_propagates_errors():
+    def failing():
+        yield 1
+        raise KeyError("platform down")
+
+    def failing_at_creation():
+        raise ConnectionError("unreachable")
+
+    with pytest.raises(KeyError, match="platform down"):
+        list(merge_generators([failing, lambda: iter(range(3))]))
+
+    with pytest.raises(ConnectionError, match="unreachable"):
+        list(merge_generators([failing_at_creation]))
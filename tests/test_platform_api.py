@@ -0,0 +1,102 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from git_backuper import git_backuper
+from git_backuper.git_backuper import GitHubApi, GitLabApi, JsonFileCache, PlatformApi
+
+TOTAL_PAGES = 4
+ITEMS_PER_PAGE = 3
+
+
+class FakeResponse:
+    def __init__(self, data, headers: dict):
+        self.status_code = 200
+        self.text = json.dumps(data)
+        self.content = self.text.encode()
+        self.headers = CaseInsensitiveDict(headers)
+
+
+class FakeSession:
+    """Answers every url with a page of items, announcing TOTAL_PAGES pages the way each platform does."""
+
+    def get(self, url: str, headers=None, timeout=None) -> FakeResponse:
+        parsed_url = urlparse(url)
+        page = int(parse_qs(parsed_url.query)["page"][0])
+        data = [{"page": page, "index": index} for index in range(ITEMS_PER_PAGE)]
+        last_url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?page={TOTAL_PAGES}"
+        return FakeResponse(data, {"Link": f'<{last_url}>; rel="last"', "X-Total-Pages": str(TOTAL_PAGES)})
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("api", [GitHubApi("user", "token"), GitLabApi("user", "token")])
+def test_fetch_from_the_only_worker_of_its_executor(api: PlatformApi):
+    # the remaining pages are submitted to the executor the fetch itself runs on : with a single thread,
+    # they can only run if the fetch takes them back, instead of waiting on them
+    api.session = FakeSession()  # type: ignore
+    executor = ThreadPoolExecutor(max_workers=1)
+    api.executor = executor
+    try:
+        elements = executor.submit(api.fetch, "projects").result(timeout=10)
+    finally:
+        # on a deadlock, cancelling the queued pages releases the worker waiting on them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    assert len(elements) == TOTAL_PAGES * ITEMS_PER_PAGE
+    assert [element["page"] for element in elements[::ITEMS_PER_PAGE]] == list(range(1, TOTAL_PAGES + 1))
+
+
+class ConditionalSession:
+    """Serves fixed pages of 100 items like GitHub does, answering 304 when the ETag of the page didn't change."""
+
+    def __init__(self, total_items: int, pagination_on_304: bool = True):
+        self.total_items = total_items
+        self.pagination_on_304 = pagination_on_304
+        self.statuses = []
+
+    def get(self, url: str, headers=None, timeout=None) -> FakeResponse:
+        parsed_url = urlparse(url)
+        page = int(parse_qs(parsed_url.query)["page"][0])
+        data = [{"index": index} for index in range((page - 1) * 100, min(page * 100, self.total_items))]
+        last_page = max(1, -(-self.total_items // 100))
+        pagination_headers = {}
+        if last_page > 1:
+            last_url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?page={last_page}"
+            pagination_headers["Link"] = f'<{last_url}>; rel="last"'
+        etag = f'"{len(data)}-{data[0]["index"] if data else ""}"'
+
+        if (headers or {}).get("If-None-Match") == etag:
+            response = FakeResponse(None, {"ETag": etag, **(pagination_headers if self.pagination_on_304 else {})})
+            response.status_code = 304
+        else:
+            response = FakeResponse(data, {"ETag": etag, **pagination_headers})
+        self.statuses.append((page, response.status_code))
+        return response
+
+
+@pytest.mark.parametrize("pagination_on_304", [True, False])
+def test_fetch_finds_new_pages_behind_an_unchanged_first_page(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, pagination_on_304: bool
+):
+    monkeypatch.setattr(git_backuper, "ETAGS_CACHE", JsonFileCache(tmp_path / "etags.json"))
+    api = GitHubApi("user", "token")
+
+    api.session = ConditionalSession(100, pagination_on_304)  # type: ignore
+    assert len(api.fetch("user/repos")) == 100
+
+    # a 101st repository lands on a new page, while the first page stays the same
+    api.session = ConditionalSession(101, pagination_on_304)  # type: ignore
+    elements = api.fetch("user/repos")
+
+    assert api.session.statuses[0] == (1, 304)
+    assert [element["index"] for element in elements] == list(range(101))
+    if pagination_on_304:
+        # the pagination headers of the 304 replace the outdated cached ones
+        first_page_url = f"{api.root_url}/user/repos?visibility=all&per_page=100&page=1"
+        assert "Link" in git_backuper.ETAGS_CACHE.get(f"user@{first_page_url}")["headers"]